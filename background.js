@@ -74,6 +74,38 @@ chrome.runtime.onMessage.addListener((message, sender, sendResponse) => {
     }
 });
 
+// Local ingest service of the AI Code Assistant (python AI.py serve). When it is running,
+// recordings share its prompt cache, job queue and quotas instead of calling Gemini directly.
+const LOCAL_INGEST_URL = "http://127.0.0.1:8765/ingest";
+
+// Returns {script, modelUsed} from the local service, or null if it is not running
+async function generateViaLocalService(xpathDetails) {
+    let response;
+    try {
+        response = await fetch(LOCAL_INGEST_URL, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ recordings: [xpathDetails] })
+        });
+    } catch (e) {
+        console.log("Local ingest service not available, calling Gemini directly");
+        return null;
+    }
+    if (!response.ok) {
+        throw new Error(`Local ingest service error: ${(await response.text()) || response.status}`);
+    }
+    // One JSON line per recording (NDJSON); this request only sends one
+    const lines = (await response.text()).split('\n').filter(line => line.trim());
+    const result = lines.length ? JSON.parse(lines[0]) : null;
+    if (!result || result.state !== 'done') {
+        throw new Error(`Local ingest service could not generate the script: ${result ? result.error : "no result"}`);
+    }
+    return {
+        script: result.suite,
+        modelUsed: "AI Code Assistant (local)"
+    };
+}
+
 // Function to generate Robot Framework script in the background
 async function generateRobotScriptInBackground(xpathDetails) {
     console.log("Starting background script generation for:", xpathDetails);
@@ -108,6 +140,11 @@ async function generateRobotScriptInBackground(xpathDetails) {
     });
     
     try {
+        const localResult = await generateViaLocalService(xpathDetails);
+        if (localResult) {
+            return localResult;
+        }
+
         // Get API key from storage
         const apiKeyData = await chrome.storage.local.get('geminiApiKey');
         const geminiApiKey = apiKeyData.geminiApiKey;
@@ -0,0 +1,222 @@
+"""Shared fixtures for the AI.py performance benchmarks.
+
+Run with pytest-benchmark (see requirements-dev.txt) from the repository root.
+The benchmarks are not part of the default ``python -m pytest`` run:
+
+    python -m pytest benchmarks --benchmark-autosave
+
+Every run is stored under ``.benchmarks/`` together with the current commit,
+so a later run can be compared against it and fail on regressions:
+
+    python -m pytest benchmarks --benchmark-compare --benchmark-compare-fail=mean:15%
+
+Timings only compare on the same machine, so ``.benchmarks/`` is not
+committed. Each machine (or CI cache) keeps its own history of runs.
+
+The size of the synthetic data is controlled with the ``--bench-*`` options
+below (e.g. ``--bench-files=500000`` for a very large project tree).
+"""
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import AI  # noqa: E402
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("AI.py benchmarks")
+    group.addoption("--bench-files", type=int, default=10000,
+                    help="Number of .py/.robot files in the synthetic project tree.")
+    group.addoption("--bench-file-lines", type=int, default=50000,
+                    help="Number of lines in the large single .robot file.")
+    group.addoption("--bench-history", type=int, default=5000,
+                    help="Number of entries in the synthetic history log.")
+    group.addoption("--bench-latency", type=float, default=0.05,
+                    help="Seconds of latency injected into every stub model call.")
+
+
+# ---
+# ===== Synthetic Data =====
+ROBOT_TEST_CASE = """Test Case {n}
+    [Documentation]    Generated test case number {n}
+    ${{visible}}=    Run Keyword And Return Status
+    ...    Wait Until Element Is Visible    ${{LOCATOR_{n}}}    timeout=${{TIMEOUT}}
+    Run Keyword If    ${{visible}}    Click Element    ${{LOCATOR_{n}}}
+    Log    Step {n} done
+
+"""
+
+PYTHON_FUNCTION = """def function_{n}(value):
+    \"\"\"Generated helper number {n}.\"\"\"
+    return value * {n}
+
+
+"""
+
+
+def _write_robot_file(path, test_cases):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("*** Settings ***\nLibrary    SeleniumLibrary\n\n*** Test Cases ***\n")
+        for n in range(test_cases):
+            f.write(ROBOT_TEST_CASE.format(n=n))
+
+
+@pytest.fixture(scope="session")
+def synthetic_project(request, tmp_path_factory):
+    """A project tree of --bench-files small .py/.robot files plus unrelated files."""
+    total = request.config.getoption("--bench-files")
+    root = tmp_path_factory.mktemp("project")
+    per_dir = 200
+    for n in range(total):
+        directory = root / f"pkg_{n // per_dir}"
+        if n % per_dir == 0:
+            directory.mkdir()
+            (directory / "README.md").write_text("not scanned\n", encoding="utf-8")
+        if n % 2:
+            (directory / f"suite_{n}.robot").write_text(ROBOT_TEST_CASE.format(n=n), encoding="utf-8")
+        else:
+            (directory / f"module_{n}.py").write_text(PYTHON_FUNCTION.format(n=n), encoding="utf-8")
+    return str(root)
+
+
+@pytest.fixture(scope="session")
+def large_robot_file(request, tmp_path_factory):
+    """A single .robot file with roughly --bench-file-lines lines."""
+    lines = request.config.getoption("--bench-file-lines")
+    path = tmp_path_factory.mktemp("large") / "large_suite.robot"
+    _write_robot_file(path, max(1, lines // ROBOT_TEST_CASE.count("\n")))
+    return str(path)
+
+
+@pytest.fixture
+def history_log(request, tmp_path):
+    """A JSON history file pre-filled with --bench-history prompts."""
+    entries = request.config.getoption("--bench-history")
+    path = str(tmp_path / "prompt_history.json")
+    with open(path, "w", encoding="utf-8") as f:
+        AI.json.dump([f"Add validation and screenshots to step {n}" for n in range(entries)], f, indent=4)
+    return path
+
+
+# ---
+# ===== Stub Model =====
+class StubResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class StubModel:
+    """Stands in for GenerativeModel, sleeping for a fixed latency on each call."""
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.calls = 0
+
+    def generate_content(self, contents, **kwargs):
+        self.calls += 1
+        time.sleep(self.latency)
+        prompt = contents if isinstance(contents, str) else repr(contents)
+        body = prompt.split("```")[-2] if prompt.count("```") >= 2 else prompt
+        return StubResponse(f"```\n{body.strip()}\n```")
+
+
+@pytest.fixture
+def stub_model(request, monkeypatch):
+    stub = StubModel(request.config.getoption("--bench-latency"))
+    monkeypatch.setattr(AI, "model", stub)
+    # Local stand-in for the Gemini backend, shared by every instruction template
+    monkeypatch.setattr(AI, "instruction_models", AI.InstructionModels(model_factory=lambda instructions: stub))
+    # Benchmark rounds must not run into the hourly request budget
+    monkeypatch.setattr(AI, "generation_quota", AI.RequestQuota(float("inf")))
+    return stub
+
+
+# ---
+# ===== Headless Editor =====
+class FakeWidget:
+    """Minimal stand-in for the Tk widgets touched by AICodeEditor's hot paths."""
+
+    def __init__(self, value=""):
+        self.value = value
+
+    def get(self, *args):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+    def insert(self, index, text):
+        self.value += text
+
+    def delete(self, *args):
+        self.value = ""
+
+    def config(self, **kwargs):
+        pass
+
+    def tag_configure(self, *args, **kwargs):
+        pass
+
+    def tag_add(self, *args):
+        pass
+
+    def update_idletasks(self):
+        pass
+
+
+@pytest.fixture
+def headless_editor(monkeypatch, tmp_path):
+    """An AICodeEditor whose widgets are fakes and whose dialogs auto-confirm."""
+    for name in ("showinfo", "showwarning", "showerror"):
+        monkeypatch.setattr(AI.messagebox, name, lambda *args, **kwargs: None)
+    monkeypatch.setattr(AI.messagebox, "askyesno", lambda *args, **kwargs: True)
+    monkeypatch.setattr(AI, "PROMPT_HISTORY_FILE", str(tmp_path / "prompt_history.json"))
+    monkeypatch.setattr(AI, "CHAT_HISTORY_FILE", str(tmp_path / "chat_history.json"))
+    monkeypatch.setattr(AI, "GENERATION_HISTORY_DIR", str(tmp_path / "generation_history"))
+    monkeypatch.setattr(AI, "CHANGESET_JOURNAL_DIR", str(tmp_path / "apply_journal"))
+
+    editor = AI.AICodeEditor.__new__(AI.AICodeEditor)
+    editor.window = FakeWidget()
+    editor.project_root = FakeWidget(str(tmp_path))
+    editor.current_file = FakeWidget()
+    editor.generated_code = ""
+    editor.original_code_segment = ""
+    editor.is_showing_diff = False
+    editor.is_generated_output_editable = False
+    editor.generation_history = None
+    editor.root_state = None
+    editor.changeset = AI.ChangeSet(journal_dir=str(tmp_path / "apply_journal"))
+    editor.block_index = AI.BlockFingerprintIndex(cache_file=str(tmp_path / "block_cache.jsonl"))
+    editor.workspace = AI.Workspace(workspace_dir=str(tmp_path / "workspace"))
+    editor.workspace.result_cache = editor.block_index.results
+    editor.job_queue = AI.JobQueue(str(tmp_path / "jobs.sqlite3"))
+    editor.review_queue = AI.ReviewQueue(editor.job_queue.db_path)
+    editor._interactive_worker = AI.JobWorker(editor.job_queue, review_queue=editor.review_queue,
+                                              workspace=editor.workspace)
+    for name in ("start_line_entry", "end_line_entry", "ai_start_line_entry", "ai_end_line_entry",
+                 "code_viewer", "prompt_input", "generated_output", "accuracy_label",
+                 "generate_button", "generate_validation_button", "apply_button", "add_to_changeset_button",
+                 "apply_changeset_button", "cancel_button",
+                 "toggle_diff_button", "edit_generated_code_button", "undo_button", "redo_button",
+                 "prompt_history_box", "chat_history_box", "job_counts_label", "jobs_box"):
+        setattr(editor, name, FakeWidget())
+    return editor
+
+
+def _select_range(editor, file_path, start, end, prompt=""):
+    """Points the headless editor at a file, a line range and a prompt."""
+    editor.current_file.set(file_path)
+    for entry in (editor.start_line_entry, editor.ai_start_line_entry):
+        entry.set(str(start))
+    for entry in (editor.end_line_entry, editor.ai_end_line_entry):
+        entry.set(str(end))
+    editor.prompt_input.set(prompt)
+
+
+@pytest.fixture
+def select_range():
+    return _select_range
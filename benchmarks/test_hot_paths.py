@@ -0,0 +1,149 @@
+"""Benchmarks for the hot paths of AI.py.
+
+Model calls go through the latency-injecting StubModel from conftest.py, so
+the numbers reflect local overhead plus a fixed, known model latency.
+"""
+import itertools
+import shutil
+
+import AI
+
+PROMPT = ("Plese add valdation for evry step, take a screenshott on failure and log "
+          "the reslt of each actoin to the consle ") * 20
+
+
+def test_get_project_files(benchmark, synthetic_project):
+    files = benchmark(AI.get_project_files, synthetic_project)
+    assert files
+
+
+def test_correct_prompt(benchmark):
+    corrected = benchmark(AI.correct_prompt, PROMPT)
+    assert corrected
+
+
+def test_load_code_segment(benchmark, headless_editor, select_range, large_robot_file):
+    select_range(headless_editor, large_robot_file, 1000, 1500)
+    benchmark(headless_editor.load_code_segment)
+    assert headless_editor.code_viewer.get()
+
+
+def test_show_diff_view(benchmark, headless_editor, large_robot_file):
+    with open(large_robot_file, "r", encoding="utf-8") as f:
+        segment = "".join(f.readlines()[:2000])
+    headless_editor.original_code_segment = segment
+    headless_editor.generated_code = segment.replace("Click Element", "Click Button")
+    benchmark(headless_editor.show_diff_view)
+    assert headless_editor.is_showing_diff
+
+
+def test_apply_generated_code_splice(benchmark, headless_editor, select_range, large_robot_file, tmp_path):
+    target = str(tmp_path / "suite.robot")
+    shutil.copyfile(large_robot_file, target)
+    with open(target, "r", encoding="utf-8") as f:
+        replacement = "".join(f.readlines()[999:1500]).replace("Click Element", "Click Button")
+
+    def apply():
+        select_range(headless_editor, target, 1000, 1500)
+        headless_editor.generated_output.set(replacement)
+        headless_editor.apply_generated_code()
+
+    benchmark(apply)
+
+
+def test_save_history(benchmark, history_log):
+    counter = itertools.count()
+    benchmark(lambda: AI.save_history(history_log, f"New prompt {next(counter)}"))
+
+
+def test_load_history(benchmark, history_log):
+    history = benchmark(AI.load_history, history_log)
+    assert history
+
+
+def test_generate_ai_code(benchmark, headless_editor, select_range, stub_model, large_robot_file):
+    select_range(headless_editor, large_robot_file, 1000, 1200, "Add logging to every step")
+    benchmark.pedantic(headless_editor.generate_ai_code, rounds=10)
+    assert headless_editor.generated_code
+
+
+def test_generate_validation_task(benchmark, headless_editor, select_range, stub_model, large_robot_file):
+    select_range(headless_editor, large_robot_file, 1000, 1200, "Validate each action")
+    benchmark.pedantic(headless_editor._generate_validation_task, rounds=10)
+    assert headless_editor.generated_code
+
+
+def test_generation_history_append(benchmark, large_robot_file, tmp_path):
+    with open(large_robot_file, "r", encoding="utf-8") as f:
+        segment = "".join(f.readlines()[:500])
+    history = AI.GenerationHistory(large_robot_file, 1, 500, segment, history_dir=str(tmp_path))
+    counter = itertools.count()
+    benchmark(lambda: history.append(segment.replace("Step 1", f"Step {next(counter)}"), "Rename step"))
+
+
+def test_generation_history_undo_redo(benchmark, large_robot_file, tmp_path):
+    with open(large_robot_file, "r", encoding="utf-8") as f:
+        segment = "".join(f.readlines()[:500])
+    history = AI.GenerationHistory(large_robot_file, 1, 500, segment, history_dir=str(tmp_path))
+    for n in range(AI.HISTORY_SNAPSHOT_INTERVAL * 3):
+        history.append(segment.replace("Step 1", f"Step {n}"), "Rename step")
+
+    def undo_redo():
+        history.undo()
+        history.redo()
+
+    benchmark(undo_redo)
+
+
+def test_definition_index_build(benchmark, synthetic_project):
+    files = AI.get_project_files(synthetic_project)
+    benchmark.pedantic(lambda: AI.DefinitionIndex().update(files), rounds=3)
+
+
+def test_definition_index_grounding(benchmark, synthetic_project, large_robot_file):
+    index = AI.DefinitionIndex()
+    index.update(AI.get_project_files(synthetic_project))
+    with open(large_robot_file, "r", encoding="utf-8") as f:
+        segment = "".join(f.readlines()[1000:1200])
+    context = benchmark(index.grounding_context, segment)
+    assert context
+
+
+def test_changeset_apply_many_files(benchmark, synthetic_project, tmp_path):
+    suites = [path for path in AI.get_project_files(synthetic_project) if path.endswith(".robot")][:200]
+
+    def apply():
+        changeset = AI.ChangeSet(journal_dir=str(tmp_path / "journal"))
+        for path in suites:
+            changeset.add(path, 2, 2, "    [Documentation]    Regenerated test case")
+            changeset.add(path, 6, 6, "    Log    Regenerated step\n    Log    Extra step")
+        changeset.apply()
+
+    benchmark.pedantic(apply, rounds=5)
+
+
+def test_block_fingerprint_index_build(benchmark, synthetic_project, tmp_path):
+    files = AI.get_project_files(synthetic_project)
+
+    def build():
+        AI.BlockFingerprintIndex(cache_file=str(tmp_path / "block_cache.jsonl")).update(files)
+
+    benchmark.pedantic(build, rounds=3)
+
+
+def test_workspace_switch_warm_roots(benchmark, synthetic_project, tmp_path):
+    workspace = AI.Workspace(workspace_dir=str(tmp_path / "workspace"))
+    workspace.result_cache = AI.BlockResultCache(cache_file=str(tmp_path / "block_cache.jsonl"))
+    roots = [synthetic_project, str(tmp_path)]
+    for root in roots:
+        workspace.get(root)
+    cycle = itertools.cycle(roots)
+    state = benchmark(lambda: workspace.get(next(cycle)))
+    assert state.files is not None
+
+
+def test_workspace_load_persisted_root(benchmark, synthetic_project, tmp_path):
+    data_dir = str(tmp_path / "root")
+    AI.RootState.load(synthetic_project, data_dir)  # Scans once and persists the index
+    state = benchmark.pedantic(AI.RootState.load, args=(synthetic_project, data_dir), rounds=3)
+    assert state.files
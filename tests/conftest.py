@@ -0,0 +1,63 @@
+"""Shared setup for the AI.py behaviour tests.
+
+Run from the repository root:
+
+    python -m pytest
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import AI  # noqa: E402
+
+
+def write(path, text):
+    """Writes `text` to `path`, giving the file a new mtime however coarse the filesystem's clock."""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+
+class StubResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class StubModel:
+    """Answers every request with `text`, or raises it when it is an exception."""
+
+    def __init__(self, text):
+        self.text = text
+        self.calls = 0
+
+    def generate_content(self, contents, **kwargs):
+        self.calls += 1
+        if isinstance(self.text, Exception):
+            raise self.text
+        return StubResponse(self.text)
+
+
+@pytest.fixture
+def stub_text():
+    """What the stub model answers; override this fixture in a test module to change it."""
+    return "Log    ok"
+
+
+@pytest.fixture
+def quota_limit():
+    """The generation quota while the stub model is in place; override it like `stub_text`."""
+    return 100
+
+
+@pytest.fixture
+def stub_model(monkeypatch, stub_text, quota_limit):
+    stub = StubModel(stub_text)
+    monkeypatch.setattr(AI, "model", stub)
+    monkeypatch.setattr(AI, "instruction_models", AI.InstructionModels(model_factory=lambda instructions: stub))
+    monkeypatch.setattr(AI, "request_hedger", AI.RequestHedger())
+    monkeypatch.setattr(AI, "generation_quota", AI.RequestQuota(quota_limit))
+    return stub
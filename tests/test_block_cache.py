@@ -0,0 +1,138 @@
+"""Behaviour tests for duplicate-block detection and the shared block result cache."""
+import os
+
+import pytest
+
+import AI
+
+LOGIN = """Login As Admin
+    Input Text    ${USERNAME_FIELD}    ${ADMIN_USER}
+    Input Password    ${PASSWORD_FIELD}    ${ADMIN_PASSWORD}
+    Click Button    ${LOGIN_BUTTON}
+    Wait Until Page Contains    Welcome back
+    Page Should Contain Element    ${LOGOUT_LINK}
+"""
+
+# The same block with its name, variables, spacing and a comment changed
+LOGIN_COPY = """Login As Guest
+    # Same steps, other account
+    Input Text      ${user_field}    ${GUEST_USER}
+
+    Input Password    ${pass_field}    ${GUEST_PASSWORD}
+    Click Button    ${SUBMIT}
+    Wait Until Page Contains    Welcome back
+    Page Should Contain Element    ${logout}
+"""
+
+# One step more than LOGIN: a near duplicate
+LOGIN_NEAR = LOGIN + "    Capture Page Screenshot\n"
+
+GENERATED = """Login As Admin
+    ${ok}=    Run Keyword And Return Status    Input Text    ${USERNAME_FIELD}    ${ADMIN_USER}
+    Input Password    ${PASSWORD_FIELD}    ${ADMIN_PASSWORD}
+    Click Button    ${LOGIN_BUTTON}
+    Wait Until Page Contains    Welcome back
+    Page Should Contain Element    ${LOGOUT_LINK}
+    Log    ${ok}
+"""
+
+
+def block(text):
+    return AI.parse_robot_blocks("suite.robot", ["*** Keywords ***\n"] + text.splitlines(keepends=True))[0]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return AI.BlockResultCache(str(tmp_path / "block_cache.jsonl"))
+
+
+def test_identical_blocks_share_a_fingerprint():
+    assert AI.BlockFingerprintIndex.fingerprint(LOGIN) == AI.BlockFingerprintIndex.fingerprint(LOGIN_COPY)
+    assert AI.BlockFingerprintIndex.fingerprint(LOGIN) != AI.BlockFingerprintIndex.fingerprint(LOGIN_NEAR)
+
+
+def test_fan_out_renames_the_name_line_and_variables_by_position():
+    source_variables = AI.normalize_block(LOGIN)[1]
+
+    adapted = AI.fan_out_generated_code(GENERATED, "Login As Admin", source_variables, block(LOGIN_COPY))
+
+    assert adapted == """Login As Guest
+    ${ok}=    Run Keyword And Return Status    Input Text    ${user_field}    ${GUEST_USER}
+    Input Password    ${pass_field}    ${GUEST_PASSWORD}
+    Click Button    ${SUBMIT}
+    Wait Until Page Contains    Welcome back
+    Page Should Contain Element    ${logout}
+    Log    ${ok}
+"""
+
+
+def test_an_exact_hit_is_adapted_to_the_block_looked_up(cache):
+    cache.remember(block(LOGIN), GENERATED)
+
+    kind, code = cache.lookup(block(LOGIN_COPY))
+
+    assert kind == "exact"
+    assert code.startswith("Login As Guest\n")
+    assert "${GUEST_PASSWORD}" in code and "${ADMIN_PASSWORD}" not in code
+
+
+def test_results_are_kept_apart_by_prompt(cache):
+    cache.remember(block(LOGIN), GENERATED, prompt="Add screenshots")
+
+    assert cache.lookup(block(LOGIN)) is None
+    assert cache.lookup(block(LOGIN), prompt="Add screenshots")[0] == "exact"
+
+
+def test_a_near_duplicate_is_offered_the_cached_result(cache):
+    cache.remember(block(LOGIN), GENERATED)
+
+    kind, code, similarity = cache.lookup(block(LOGIN_NEAR))
+
+    assert kind == "near"
+    assert code == GENERATED
+    assert AI.NEAR_DUPLICATE_THRESHOLD <= similarity < 1
+
+
+def test_an_unrelated_block_finds_nothing(cache):
+    cache.remember(block(LOGIN), GENERATED)
+    unrelated = "Open Reports\n    Go To    ${REPORTS_URL}\n    Page Should Contain    Monthly totals\n"
+
+    assert cache.lookup(block(unrelated)) is None
+
+
+def test_the_log_is_reloaded_with_the_last_result_of_each_key(cache):
+    cache.remember(block(LOGIN), "first")
+    cache.remember(block(LOGIN), GENERATED)
+
+    reloaded = AI.BlockResultCache(cache.cache_file)
+
+    assert reloaded.lookup(block(LOGIN)) == ("exact", GENERATED)
+    assert reloaded.lookup(block(LOGIN_NEAR))[0] == "near"
+
+
+def test_a_torn_last_line_is_dropped_and_the_log_compacted(cache):
+    cache.remember(block(LOGIN), "first")
+    cache.remember(block(LOGIN), GENERATED)
+    with open(cache.cache_file, "a", encoding="utf-8") as f:
+        f.write('{"generated": "cut sho')
+
+    reloaded = AI.BlockResultCache(cache.cache_file)
+
+    assert reloaded.lookup(block(LOGIN)) == ("exact", GENERATED)
+    with open(cache.cache_file, "r", encoding="utf-8") as f:
+        assert len(f.readlines()) == 1
+
+
+def test_the_index_finds_copies_across_files(tmp_path, cache):
+    first, second = tmp_path / "first.robot", tmp_path / "second.robot"
+    first.write_text("*** Keywords ***\n" + LOGIN, encoding="utf-8")
+    second.write_text("*** Keywords ***\n" + LOGIN_NEAR + "\n" + LOGIN_COPY, encoding="utf-8")
+    index = AI.BlockFingerprintIndex(result_cache=cache)
+    index.update([str(first), str(second)])
+
+    source = index.block_at(str(first), 2, 7)
+    occurrences = index.occurrences(source)
+
+    assert [(os.path.basename(other["file"]), other["name"]) for other in occurrences] == \
+        [("second.robot", "Login As Guest")]
+    assert index.block_at(str(first), 2, 5) is None  # Only part of the block
@@ -0,0 +1,217 @@
+"""Behaviour tests for ChangeSet and its write-ahead journal."""
+import os
+import threading
+
+import pytest
+
+import AI
+from conftest import write
+
+
+class Killed(BaseException):
+    """Stands in for the process dying in the middle of an apply."""
+
+
+def read(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+@pytest.fixture
+def files(tmp_path):
+    first = tmp_path / "first.robot"
+    second = tmp_path / "second.robot"
+    write(first, "a\nb\nc\n")
+    write(second, "x\ny\nz\n")
+    return str(first), str(second)
+
+
+def crash_during_apply(monkeypatch, changeset, should_crash):
+    """Runs changeset.apply() and kills it at the first call for which should_crash(dst) is true,
+    leaving the files and the journal as a killed process would."""
+    real_write, real_replace = AI._write_durably, AI.os.replace
+
+    def write_durably(file_path, text):
+        if should_crash("write", file_path):
+            raise Killed()
+        real_write(file_path, text)
+
+    def replace(src, dst):
+        if should_crash("replace", dst):
+            raise Killed()
+        real_replace(src, dst)
+
+    monkeypatch.setattr(AI, "_write_durably", write_durably)
+    monkeypatch.setattr(AI.os, "replace", replace)
+    # A killed process never reaches its own rollback
+    monkeypatch.setattr(AI, "_rollback_records", lambda state, records: None)
+    monkeypatch.setattr(AI.shutil, "rmtree", lambda *args, **kwargs: None)
+    with pytest.raises(Killed):
+        changeset.apply()
+    monkeypatch.undo()
+
+
+def test_apply_rebases_ranges_on_earlier_edits(tmp_path):
+    path = str(tmp_path / "suite.robot")
+    write(path, "".join(f"line {n}\n" for n in range(1, 11)))
+    changeset = AI.ChangeSet(str(tmp_path / "journal"))
+    changeset.add(path, 2, 3, "two\n")                    # 2 lines -> 1
+    changeset.add(path, 6, 6, "six a\nsix b\nsix c\n")    # 1 line -> 3
+    changeset.add(path, 9, 8, "before nine\n")            # Insert before line 9
+
+    ranges = changeset.apply()[os.path.abspath(path)]
+
+    lines = read(path).splitlines()
+    assert ranges == [(2, 2), (5, 7), (10, 10)]
+    assert lines[1:2] == ["two"]
+    assert lines[4:7] == ["six a", "six b", "six c"]
+    assert lines[9:10] == ["before nine"]
+    assert lines[-1] == "line 10"
+    assert len(changeset) == 0
+
+
+def test_edit_reaching_the_last_line_keeps_the_trailing_newline(files, tmp_path):
+    first, second = files
+    changeset = AI.ChangeSet(str(tmp_path / "journal"))
+    changeset.add(first, 2, 3, "B\nC")
+    changeset.add(second, 4, 3, "appended")
+    changeset.apply()
+
+    assert read(first) == "a\nB\nC\n"
+    assert read(second) == "x\ny\nz\nappended\n"
+
+
+def test_edit_keeps_a_missing_trailing_newline_missing(tmp_path):
+    path = str(tmp_path / "suite.robot")
+    write(path, "a\nb")
+    changeset = AI.ChangeSet(str(tmp_path / "journal"))
+    changeset.add(path, 2, 2, "B")
+    changeset.apply()
+
+    assert read(path) == "a\nB"
+
+
+def test_insert_after_a_last_line_without_trailing_newline_starts_a_new_line(tmp_path):
+    path = str(tmp_path / "suite.robot")
+    write(path, "a\nb")
+    changeset = AI.ChangeSet(str(tmp_path / "journal"))
+    changeset.add(path, 3, 2, "c")
+
+    ranges = changeset.apply()[os.path.abspath(path)]
+
+    assert read(path) == "a\nb\nc"
+    assert ranges == [(3, 3)]
+
+
+def test_apply_keeps_the_file_mode(files, tmp_path):
+    first, _ = files
+    os.chmod(first, 0o755)
+    changeset = AI.ChangeSet(str(tmp_path / "journal"))
+    changeset.add(first, 1, 1, "A\n")
+    changeset.apply()
+
+    assert os.stat(first).st_mode & 0o777 == 0o755
+
+
+def test_stale_expected_segment_leaves_every_file_untouched(files, tmp_path):
+    first, second = files
+    changeset = AI.ChangeSet(str(tmp_path / "journal"))
+    changeset.add(first, 1, 1, "A\n")
+    changeset.add(second, 2, 2, "Y\n", expected_segment="not y\n")
+
+    with pytest.raises(ValueError):
+        changeset.apply()
+    assert read(first) == "a\nb\nc\n"
+    assert read(second) == "x\ny\nz\n"
+
+
+def test_recover_rolls_back_an_apply_killed_while_preparing(files, tmp_path, monkeypatch):
+    first, second = files
+    journal_dir = str(tmp_path / "journal")
+    changeset = AI.ChangeSet(journal_dir)
+    changeset.add(first, 1, 1, "A\n")
+    changeset.add(second, 1, 1, "X\n")
+    crash_during_apply(monkeypatch, changeset,
+                       lambda call, path: call == "write" and path == second + ".changeset-tmp")
+
+    assert os.path.exists(first + ".changeset-tmp")
+    with pytest.raises(RuntimeError):
+        AI.ChangeSet(journal_dir).apply()
+
+    assert AI.recover_changeset(journal_dir) == 2
+    assert read(first) == "a\nb\nc\n"
+    assert read(second) == "x\ny\nz\n"
+    assert not os.path.exists(first + ".changeset-tmp")
+    assert not os.path.exists(journal_dir)
+
+
+def test_recover_rolls_back_an_apply_killed_while_replacing_files(files, tmp_path, monkeypatch):
+    first, second = files
+    journal_dir = str(tmp_path / "journal")
+    changeset = AI.ChangeSet(journal_dir)
+    changeset.add(first, 1, 1, "A\n")
+    changeset.add(second, 1, 1, "X\n")
+    crash_during_apply(monkeypatch, changeset, lambda call, path: call == "replace" and path == second)
+
+    assert read(first) == "A\nb\nc\n"  # Already replaced when the apply died
+
+    assert AI.recover_changeset(journal_dir) == 2
+    assert read(first) == "a\nb\nc\n"
+    assert read(second) == "x\ny\nz\n"
+    assert not os.path.exists(second + ".changeset-tmp")
+    assert not os.path.exists(journal_dir)
+
+
+def test_recover_keeps_a_committed_apply(files, tmp_path, monkeypatch):
+    first, second = files
+    journal_dir = str(tmp_path / "journal")
+    changeset = AI.ChangeSet(journal_dir)
+    changeset.add(first, 1, 1, "A\n")
+    changeset.add(second, 1, 1, "X\n")
+    # Killed after the commit record, before the journal was removed
+    monkeypatch.setattr(AI.shutil, "rmtree", lambda *args, **kwargs: None)
+    changeset.apply()
+    monkeypatch.undo()
+
+    assert AI.recover_changeset(journal_dir) == 0
+    assert read(first) == "A\nb\nc\n"
+    assert read(second) == "X\ny\nz\n"
+    assert not os.path.exists(journal_dir)
+
+
+def test_recover_leaves_an_apply_that_is_still_running_alone(files, tmp_path, monkeypatch):
+    first, second = files
+    journal_dir = str(tmp_path / "journal")
+    changeset = AI.ChangeSet(journal_dir)
+    changeset.add(first, 1, 1, "A\n")
+    changeset.add(second, 1, 1, "X\n")
+    crash_during_apply(monkeypatch, changeset, lambda call, path: call == "replace" and path == second)
+
+    with AI._journal_lock(journal_dir):  # The owner of the journal is still alive
+        assert AI.recover_changeset(journal_dir) == 0
+        assert read(first) == "A\nb\nc\n"
+        assert os.path.exists(journal_dir)
+
+    assert AI.recover_changeset(journal_dir) == 2
+    assert read(first) == "a\nb\nc\n"
+
+
+def test_concurrent_applies_run_one_after_the_other(files, tmp_path):
+    first, second = files
+    journal_dir = str(tmp_path / "journal")
+    first_changeset, second_changeset = AI.ChangeSet(journal_dir), AI.ChangeSet(journal_dir)
+    first_changeset.add(first, 1, 1, "A\n")
+    second_changeset.add(second, 1, 1, "X\n")
+
+    with AI._journal_lock(journal_dir):
+        waiting = threading.Thread(target=second_changeset.apply)
+        waiting.start()
+        waiting.join(0.3)
+        assert waiting.is_alive()
+        assert read(second) == "x\ny\nz\n"
+    waiting.join()
+    first_changeset.apply()
+
+    assert read(first) == "A\nb\nc\n"
+    assert read(second) == "X\ny\nz\n"
+    assert not os.path.exists(journal_dir)
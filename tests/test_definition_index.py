@@ -0,0 +1,104 @@
+"""Behaviour tests for DefinitionIndex search and the grounding context it builds."""
+import math
+import os
+
+import pytest
+
+import AI
+from conftest import write
+
+COMMON = """*** Variables ***
+${LOGIN_URL}    http://example.com/login
+
+*** Keywords ***
+Open Login Page
+    Go To    ${LOGIN_URL}
+
+Login Page Should Be Open
+    Location Should Be    ${LOGIN_URL}
+    Title Should Be    Login page
+    Page Should Contain    Login page open
+
+Enter Demo Username
+    Input Text    ${USERNAME_FIELD}    demo
+    Textfield Value Should Be    ${USERNAME_FIELD}    demo
+"""
+
+SEGMENT = "Login\n    Open Login Page\n    Input Text    ${USERNAME_FIELD}    demo\n"
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = tmp_path / "project"
+    root.mkdir()
+    write(root / "common.robot", COMMON)
+    write(root / "helpers.py", "def open_login_page(driver):\n    driver.get(LOGIN_URL)\n")
+    return str(root)
+
+
+@pytest.fixture
+def index(project):
+    index = AI.DefinitionIndex()
+    index.update(AI.get_project_files(project))
+    return index
+
+
+def names(definitions):
+    return [definition["name"] for definition in definitions]
+
+
+def test_definitions_referenced_by_name_rank_first(index, monkeypatch):
+    assert names(index.search(SEGMENT))[0] == "Open Login Page"
+
+    monkeypatch.setattr(AI.DefinitionIndex, "REFERENCE_BOOST", 0.0)
+    assert names(index.search(SEGMENT))[0] == "Enter Demo Username"  # Plain term matches alone prefer it
+
+
+def test_python_definitions_match_robot_style_references(index):
+    found = names(index.search("    Open Login Page    ${driver}"))
+    assert "open_login_page" in found[:3]
+
+
+def test_excluded_range_leaves_out_the_segment_itself(index, project):
+    common = os.path.join(project, "common.robot")
+    keyword = next(d for d in index.search(SEGMENT) if d["name"] == "Open Login Page")
+
+    found = names(index.search(SEGMENT, exclude=(common, keyword["line"], keyword["end_line"])))
+    assert "Open Login Page" not in found
+    assert "Login Page Should Be Open" in found
+    assert "Open Login Page" in names(index.search(SEGMENT, exclude=("other.robot", 1, 100)))
+
+
+def test_grounding_context_stays_within_the_token_budget(index):
+    first = index.search(SEGMENT)[0]
+    first_block = f"# {first['file']}:{first['line']} ({first['kind']})\n{first['text']}\n"
+
+    context = index.grounding_context(SEGMENT, token_budget=math.ceil(len(first_block) / 4))
+    assert context.startswith("Existing project definitions")
+    assert first_block in context
+    assert context.count("\n# ") == 1  # Nothing else fitted
+
+    assert len(index.grounding_context(SEGMENT)) > len(context)
+    assert index.grounding_context(SEGMENT, token_budget=1) == ""
+    assert index.grounding_context("nothing relevant here") == ""
+
+
+def test_only_new_or_modified_files_are_reparsed(index, project, monkeypatch):
+    parsed = []
+    parse_definitions = AI.parse_definitions
+    monkeypatch.setattr(AI, "parse_definitions", lambda path: parsed.append(path) or parse_definitions(path))
+    files = AI.get_project_files(project)
+    common = os.path.join(project, "common.robot")
+
+    index.update(files)
+    assert parsed == []
+
+    write(common, COMMON.replace("Open Login Page", "Open Sign In Page"))
+    index.update(files)
+    assert parsed == [common]
+    found = names(index.search("    Open Sign In Page"))
+    assert "Open Sign In Page" in found and "Open Login Page" not in found
+
+    os.remove(common)
+    index.update(AI.get_project_files(project))
+    assert not any(d["file"] == common for d in index.search(SEGMENT, top_k=100))
@@ -0,0 +1,28 @@
+"""Behaviour tests for the local checks candidate mode uses to accept generated code."""
+import AI
+
+VARIABLES = "*** Variables ***\n${LOGIN_BUTTON}    xpath://button[@id='login']\n${USERNAME}    css:#username\n"
+
+
+def test_refactored_robot_code_may_keep_its_locators():
+    assert AI.check_generated_code(VARIABLES, AI.code_language("suite.robot"))
+
+
+def test_validation_code_must_not_use_raw_locators():
+    assert not AI.check_validation_code("Click Element    xpath://button[@id='login']")
+    assert AI.check_validation_code("Click Element    ${LOGIN_BUTTON}")
+
+
+def test_robot_blocks_must_be_closed():
+    opened = "FOR    ${item}    IN    @{items}\n    Log    ${item}\n"
+    inline_if = "IF    ${ok}    Log    fine\n"
+
+    assert not AI.check_generated_code(opened, "robot")
+    assert AI.check_generated_code(opened + "END\n", "robot")
+    assert AI.check_generated_code(inline_if, "robot")
+    assert not AI.check_validation_code(opened)
+
+
+def test_python_code_must_parse():
+    assert AI.check_generated_code("    def f():\n        return 1\n", "python")
+    assert not AI.check_generated_code("def f(:\n", "python")
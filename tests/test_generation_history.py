@@ -0,0 +1,122 @@
+"""Behaviour tests for GenerationHistory's append-only log and cursor file."""
+import json
+
+import pytest
+
+import AI
+
+ORIGINAL = "Login\n    Click Button    ${LOGIN_BUTTON}\n"
+
+
+def version(n):
+    return f"Login\n    Log    version {n}\n    Click Button    ${{LOGIN_BUTTON}}\n"
+
+
+@pytest.fixture
+def open_history(tmp_path):
+    def open_history():
+        return AI.GenerationHistory("suite.robot", 1, 2, ORIGINAL, history_dir=str(tmp_path))
+    return open_history
+
+
+def log_records(history):
+    with open(history.path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_reopening_restores_entries_and_position(open_history):
+    history = open_history()
+    for n in range(3):
+        history.append(version(n), f"prompt {n}")
+    history.undo()
+
+    reopened = open_history()
+
+    assert len(reopened) == 3
+    assert reopened.current() == (version(1), "prompt 1")
+    assert reopened.redo() == (version(2), "prompt 2")
+
+
+def test_undo_only_rewrites_the_cursor(open_history):
+    history = open_history()
+    history.append(version(0), "prompt 0")
+    history.append(version(1), "prompt 1")
+    records = log_records(history)
+
+    history.undo()
+
+    assert log_records(history) == records
+    with open(history.cursor_path, "r", encoding="utf-8") as f:
+        assert f.read() == "0"
+
+
+def test_appending_after_undo_drops_the_redo_entries(open_history):
+    history = open_history()
+    for n in range(3):
+        history.append(version(n), f"prompt {n}")
+    history.undo()
+    history.undo()
+    history.append(version(9), "prompt 9")
+
+    assert {"truncate": 1} in log_records(history)
+    reopened = open_history()
+    assert len(reopened) == 2
+    assert not reopened.can_redo()
+    assert reopened.current() == (version(9), "prompt 9")
+    assert reopened.undo() == (version(0), "prompt 0")
+
+
+def test_entries_beyond_the_limit_are_dropped_and_replayed(open_history, monkeypatch):
+    monkeypatch.setattr(AI, "HISTORY_MAX_ENTRIES", 4)
+    history = open_history()
+    for n in range(6):
+        history.append(version(n), f"prompt {n}")
+
+    reopened = open_history()
+
+    assert len(reopened) == 4
+    texts = [reopened.current()]
+    while reopened.can_undo():
+        texts.append(reopened.undo())
+    assert texts == [(version(n), f"prompt {n}") for n in range(5, 1, -1)]
+
+
+def test_entries_are_rebuilt_from_deltas_and_snapshots(open_history):
+    history = open_history()
+    count = AI.HISTORY_SNAPSHOT_INTERVAL * 2 + 3
+    for n in range(count):
+        history.append(version(n), f"prompt {n}")
+
+    reopened = open_history()
+
+    assert sum("snapshot" in entry for entry in reopened.entries) == 2
+    for n in range(count - 1, 0, -1):
+        assert reopened.current()[0] == version(n)
+        reopened.undo()
+
+
+def test_a_torn_last_record_is_ignored_and_compacted(open_history):
+    history = open_history()
+    history.append(version(0), "prompt 0")
+    history.append(version(1), "prompt 1")
+    with open(history.path, "a", encoding="utf-8") as f:
+        f.write('{"entry": {"prompt": "prompt 2", "del')  # Cut short by a crash mid-append
+
+    reopened = open_history()
+
+    assert len(reopened) == 2
+    assert reopened.current() == (version(1), "prompt 1")
+    assert log_records(reopened)[0] == {"base": ORIGINAL}
+    assert len(log_records(reopened)) == 3
+
+
+def test_a_missing_or_damaged_cursor_shows_the_latest_entry(open_history):
+    history = open_history()
+    history.append(version(0), "prompt 0")
+    history.append(version(1), "prompt 1")
+    history.undo()
+    with open(history.cursor_path, "w", encoding="utf-8") as f:
+        f.write("not a number")
+
+    assert open_history().current() == (version(1), "prompt 1")
+
@@ -0,0 +1,56 @@
+"""Behaviour tests for the generation quota shared by every front-end."""
+import pytest
+
+import AI
+
+
+@pytest.fixture
+def quota_limit():
+    return 3
+
+
+def test_generation_and_chat_share_one_quota(stub_model):
+    AI.generate_refactor_code("Log    a", "rename")
+    AI.generate_validation_code("Log    b")
+    AI.GeminiChatSession().send("hello")
+
+    with pytest.raises(RuntimeError, match="3 model requests"):
+        AI.generate_refactor_code("Log    c", "rename")
+    with pytest.raises(RuntimeError):
+        AI.GeminiChatSession().send("hello again")
+    assert stub_model.calls == 3
+
+
+def test_candidate_requests_count_against_the_quota(stub_model):
+    AI.request_hedger.candidates = 3
+    AI.generate_refactor_code("Log    a", "rename", language="robot")
+
+    assert AI.generation_quota.acquire() == 0
+    assert stub_model.calls == 3
+
+
+def test_quota_in_a_database_is_shared_by_processes_and_survives_restarts(tmp_path):
+    db_path = str(tmp_path / "jobs.sqlite3")
+    gui, server = AI.RequestQuota(3, db_path=db_path), AI.RequestQuota(3, db_path=db_path)
+
+    assert gui.acquire(2) == 2
+    assert server.acquire(2) == 1
+    with pytest.raises(RuntimeError, match="try again in"):
+        gui.consume()
+    assert AI.RequestQuota(3, db_path=db_path).acquire() == 0  # After a restart
+
+
+def test_requests_older_than_the_window_no_longer_count(tmp_path, monkeypatch):
+    quota = AI.RequestQuota(1, window=60, db_path=str(tmp_path / "jobs.sqlite3"))
+    assert quota.acquire() == 1
+    assert quota.acquire() == 0
+
+    now = AI.time.time()
+    monkeypatch.setattr(AI.time, "time", lambda: now + 61)
+    assert quota.acquire() == 1
+
+
+def test_quotas_sharing_a_database_keep_separate_counts(tmp_path):
+    db_path = str(tmp_path / "jobs.sqlite3")
+    assert AI.RequestQuota(1, db_path=db_path, name="generation").acquire() == 1
+    assert AI.RequestQuota(1, db_path=db_path, name="other").acquire() == 1
@@ -0,0 +1,98 @@
+"""Behaviour tests for the local ingest service's HTTP handler."""
+import http.client
+import json
+import os
+
+import pytest
+
+import AI
+
+SUITE = "*** Settings ***\nLibrary    SeleniumLibrary\n\n*** Test Cases ***\nRecorded\n    Click Element    ${BUTTON}"
+
+
+@pytest.fixture
+def stub_text():
+    return SUITE
+
+
+@pytest.fixture
+def server(tmp_path, stub_model, monkeypatch):
+    monkeypatch.setattr(AI, "BLOCK_CACHE_FILE", str(tmp_path / "block_cache.jsonl"))
+    job_queue = AI.JobQueue(str(tmp_path / "jobs.sqlite3"))
+    server = AI.IngestServer(job_queue, str(tmp_path / "project"), port=0,
+                             workspace=AI.Workspace(workspace_dir=str(tmp_path / "workspace")))
+    server.start()
+    yield server
+    server.stop()
+
+
+def request(server, method, path, body=None, headers=None):
+    """Sends a request and returns (status, body text)."""
+    host, port = server._server.server_address[:2]
+    connection = http.client.HTTPConnection(host, port, timeout=10)
+    connection.putrequest(method, path)
+    for name, value in (headers or {}).items():
+        connection.putheader(name, value)
+    if body is not None and "Content-Length" not in (headers or {}):
+        connection.putheader("Content-Length", str(len(body)))
+    connection.endheaders(body)
+    response = connection.getresponse()
+    text = response.read().decode("utf-8")
+    connection.close()
+    return response.status, text
+
+
+def ingest(server, data):
+    status, text = request(server, "POST", "/ingest", json.dumps(data).encode("utf-8"))
+    assert status == 200
+    return sorted((json.loads(line) for line in text.splitlines()), key=lambda line: line["index"])
+
+
+def test_ingest_streams_one_suite_per_recording(server, stub_model):
+    lines = ingest(server, {"recordings": [{"name": "Login", "steps": [1]}, {"name": "Logout", "steps": [2]}]})
+
+    assert [line["name"] for line in lines] == ["Login", "Logout"]
+    assert all(line["state"] == "done" and line["error"] is None for line in lines)
+    for line in lines:
+        with open(line["file"], "r", encoding="utf-8") as f:
+            assert f.read() == SUITE + "\n"
+    assert stub_model.calls == 2
+
+
+def test_a_recording_sent_again_is_answered_without_a_model_call(server, stub_model):
+    first = ingest(server, {"name": "Login", "steps": [1]})
+    again = ingest(server, [{"name": "Login", "steps": [1]}])
+
+    assert again[0]["job_id"] == first[0]["job_id"]
+    assert again[0]["suite"] == SUITE
+    assert stub_model.calls == 1
+
+
+def test_status_reports_the_job_counts(server):
+    ingest(server, {"name": "Login", "steps": [1]})
+
+    status, text = request(server, "GET", "/status")
+
+    assert status == 200
+    assert json.loads(text) == {"jobs": {"done": 1}}
+
+
+@pytest.mark.parametrize("body, headers, expected_status", [
+    (b"{}", {"Content-Length": "abc"}, 400),
+    (b"not json", None, 400),
+    (b"[]", None, 400),
+    (b"", None, 413),
+    (b"{}", {"Origin": "https://example.com"}, 403),
+])
+def test_invalid_requests_are_rejected(server, stub_model, body, headers, expected_status):
+    status, text = request(server, "POST", "/ingest", body, headers)
+
+    assert status == expected_status
+    assert "error" in json.loads(text)
+    assert stub_model.calls == 0
+
+
+def test_unknown_paths_are_not_found(server):
+    assert request(server, "GET", "/ingest")[0] == 404
+    assert request(server, "POST", "/status", b"{}")[0] == 404
+    assert not os.path.exists(server.output_dir)
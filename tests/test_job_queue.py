@@ -0,0 +1,156 @@
+"""Behaviour tests for the durable JobQueue and the JobWorker running its jobs."""
+import os
+
+import pytest
+
+import AI
+
+BLOCK = "*** Test Cases ***\nLogin\n    Click Button    ${LOGIN_BUTTON}\n"
+VALIDATED = "Login\n    ${clicked}=    Run Keyword And Return Status    Click Button    ${LOGIN_BUTTON}\n"
+
+
+@pytest.fixture
+def stub_text():
+    return VALIDATED
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(AI.time, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def job_queue(tmp_path):
+    return AI.JobQueue(str(tmp_path / "jobs.sqlite3"))
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = tmp_path / "project"
+    root.mkdir()
+    (root / "suite.robot").write_text(BLOCK, encoding="utf-8")
+    return str(root)
+
+
+@pytest.fixture
+def worker(job_queue, tmp_path, monkeypatch):
+    monkeypatch.setattr(AI, "BLOCK_CACHE_FILE", str(tmp_path / "block_cache.jsonl"))
+    return AI.JobWorker(job_queue, workspace=AI.Workspace(workspace_dir=str(tmp_path / "workspace")))
+
+
+def test_enqueue_is_idempotent(job_queue):
+    first = job_queue.enqueue("generate", {"file": "a.robot", "start": 1})
+    assert job_queue.enqueue("generate", {"start": 1, "file": "a.robot"}) == first
+    assert job_queue.enqueue("generate", {"file": "b.robot", "start": 1}) != first
+    assert job_queue.counts() == {"pending": 2}
+
+
+def test_a_leased_job_is_claimed_again_only_after_its_lease_runs_out(job_queue, clock):
+    first = job_queue.enqueue("generate", {"n": 1})
+    second = job_queue.enqueue("generate", {"n": 2})
+
+    assert job_queue.claim()["id"] == first
+    assert job_queue.claim()["id"] == second
+    assert job_queue.claim() is None
+
+    clock.now += AI.JOB_LEASE_SECONDS / 2
+    job_queue.renew(first)  # Heartbeat of a live worker
+    clock.now += AI.JOB_LEASE_SECONDS * 3 / 4
+    reclaimed = job_queue.claim()
+    assert reclaimed["id"] == second  # Its worker stopped renewing the lease
+    assert reclaimed["attempts"] == 2
+    assert job_queue.claim() is None
+
+
+def test_a_job_whose_worker_died_on_its_last_attempt_fails(job_queue, clock):
+    job_id = job_queue.enqueue("generate", {}, max_attempts=1)
+    job_queue.claim()
+    clock.now += AI.JOB_LEASE_SECONDS + 1
+
+    assert job_queue.claim() is None
+    assert job_queue.get(job_id)["state"] == "failed"
+
+
+def test_failed_attempts_are_retried_after_a_delay_until_attempts_run_out(job_queue, clock):
+    job_id = job_queue.enqueue("generate", {}, max_attempts=2)
+    job_queue.fail(job_queue.claim()["id"], "boom")
+
+    assert job_queue.get(job_id)["state"] == "pending"
+    assert job_queue.claim() is None  # Waiting out the retry delay
+    assert job_queue.claim(job_id)["id"] == job_id  # Unless asked for explicitly
+    job_queue.fail(job_id, "boom again")
+
+    job = job_queue.get(job_id)
+    assert (job["state"], job["error"], job["attempts"]) == ("failed", "boom again", 2)
+    assert job_queue.retry_failed() == 1
+    assert job_queue.get(job_id)["state"] == "pending"
+
+
+def test_a_final_failure_is_not_retried(job_queue):
+    job_id = job_queue.enqueue("generate", {})
+    job_queue.fail(job_queue.claim()["id"], "boom", retry=False)
+    assert job_queue.get(job_id)["state"] == "failed"
+
+
+def test_a_resumed_job_does_not_pay_for_its_checkpointed_generation(job_queue, worker, project, stub_model):
+    file_path = os.path.join(project, "suite.robot")
+    job_id = job_queue.enqueue("generate", {"file": file_path, "start": 2, "end": 3, "prompt": "Rename",
+                                            "root": project})
+    job = job_queue.claim()
+    job_queue.checkpoint(job_id, {"segment": "Login\n", "generated": "Already paid for"})
+    job["checkpoint"] = job_queue.get(job_id)["checkpoint"]
+
+    finished = worker.run_job(job)
+
+    assert finished["state"] == "done"
+    assert finished["result"] == {"generated": "Already paid for"}
+    assert stub_model.calls == 0
+    assert [item["generated"] for item in worker.review_queue.items()] == ["Already paid for"]
+
+
+def test_run_job_reports_a_failure_that_will_be_retried_as_pending(job_queue, worker, project, stub_model):
+    stub_model.text = RuntimeError("model unavailable")
+    job_id = job_queue.enqueue("generate", {"file": os.path.join(project, "suite.robot"), "start": 2, "end": 3,
+                                            "prompt": "Rename", "root": project})
+
+    job = worker.run_job(job_queue.claim())
+
+    assert job["id"] == job_id
+    assert job["state"] == "pending"
+    assert "model unavailable" in job["error"]
+
+
+def test_validation_results_are_not_validated_again(job_queue, worker, project, stub_model):
+    assert AI.enqueue_project_validation(job_queue, project) == 1
+    worker.run()
+    assert stub_model.calls == 1
+
+    # The reviewed result is applied to the file
+    with open(os.path.join(project, "suite.robot"), "w", encoding="utf-8") as f:
+        f.write("*** Test Cases ***\n" + VALIDATED)
+
+    assert AI.enqueue_project_validation(job_queue, project) == 0
+    assert job_queue.counts() == {"done": 1}
+
+
+def test_validate_on_a_selected_range_runs_as_a_job(job_queue, worker, project, stub_model):
+    file_path = os.path.join(project, "suite.robot")
+    payload = {"file": file_path, "start": 2, "end": 3, "prompt": "", "root": project, "interactive": True}
+
+    first = worker.process(job_queue.enqueue("validate", payload, idempotency_key="first"), retry=False)
+    again = worker.process(job_queue.enqueue("validate", payload, idempotency_key="again"), retry=False)
+
+    assert first["result"] == {"generated": VALIDATED.strip()}
+    assert again["result"] == first["result"]
+    assert stub_model.calls == 1  # The identical block's cached result is reused
+    assert worker.review_queue.items() == []  # The GUI that asked for it shows the result itself
@@ -0,0 +1,111 @@
+"""Behaviour tests for ProjectWatcher's change detection and its saved state."""
+import os
+
+import pytest
+
+import AI
+from conftest import write
+
+SUITE = """*** Test Cases ***
+Login
+    Open Browser    ${URL}
+    Input Text    ${USERNAME_FIELD}    demo
+
+Logout
+    Click Button    ${LOGOUT_BUTTON}
+"""
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = tmp_path / "project"
+    root.mkdir()
+    write(root / "suite.robot", SUITE)
+    return str(root)
+
+
+@pytest.fixture
+def make_watcher(project, tmp_path):
+    def make():
+        root_state = AI.RootState(project, str(tmp_path / "data"),
+                                  AI.BlockResultCache(str(tmp_path / "block_cache.jsonl")))
+        return AI.ProjectWatcher(project, state_file=str(tmp_path / "watch_state.json"),
+                                 review_queue=AI.ReviewQueue(str(tmp_path / "jobs.sqlite3")),
+                                 root_state=root_state)
+    return make
+
+
+def test_first_scan_only_records_a_baseline(make_watcher):
+    changed, state_changed = make_watcher().scan()
+
+    assert changed == []
+    assert state_changed
+
+
+def test_scan_returns_only_the_edited_block(make_watcher, project):
+    watcher = make_watcher()
+    watcher.scan()
+    write(os.path.join(project, "suite.robot"), SUITE.replace("demo", "admin"))
+
+    changed, state_changed = watcher.scan()
+
+    assert [block["name"] for block in changed] == ["Login"]
+    assert state_changed
+
+
+def test_scan_without_changes_reports_nothing(make_watcher):
+    watcher = make_watcher()
+    watcher.scan()
+
+    assert watcher.scan() == ([], False)
+
+
+def test_changes_made_while_stopped_are_found_on_the_next_start(make_watcher, project):
+    watcher = make_watcher()
+    watcher.scan()
+    watcher.save_state()
+    write(os.path.join(project, "suite.robot"), SUITE.replace("${LOGOUT_BUTTON}", "${SIGN_OUT_BUTTON}"))
+
+    changed, _ = make_watcher().scan()
+
+    assert [block["name"] for block in changed] == ["Logout"]
+
+
+def test_applied_results_are_not_regenerated(make_watcher, project):
+    watcher = make_watcher()
+    watcher.scan()
+    applied = SUITE.replace("    Click Button    ${LOGOUT_BUTTON}", "    Log    logged out")
+    watcher._remember_generated(AI.hash_block("Logout\n    Log    logged out\n"))
+    write(os.path.join(project, "suite.robot"), applied)
+
+    assert watcher.scan() == ([], True)
+
+
+def test_deleted_files_leave_the_state(make_watcher, project):
+    watcher = make_watcher()
+    watcher.scan()
+    os.remove(os.path.join(project, "suite.robot"))
+
+    assert watcher.scan() == ([], True)
+    assert watcher.state["files"] == {}
+
+
+def test_poll_only_saves_the_state_when_something_changed(make_watcher, monkeypatch):
+    watcher = make_watcher()
+    saves = []
+    monkeypatch.setattr(watcher, "save_state", lambda: saves.append(True))
+
+    watcher.poll_once()
+    watcher.poll_once()
+
+    assert saves == [True]
+
+
+def test_only_the_newest_generated_hashes_are_kept(make_watcher, tmp_path, monkeypatch):
+    monkeypatch.setattr(AI, "WATCH_MAX_GENERATED", 3)
+    watcher = make_watcher()
+    for n in range(5):
+        watcher._remember_generated(f"hash {n}")
+    watcher.save_state()
+
+    assert make_watcher().state["generated"] == ["hash 2", "hash 3", "hash 4"]
@@ -0,0 +1,76 @@
+"""Behaviour tests for RequestHedger's duplicated (hedged) requests."""
+import threading
+import time
+
+import pytest
+
+import AI
+
+
+class SlowCall:
+    """Stands in for a model request: the n-th call takes delays[n] seconds and returns n."""
+
+    def __init__(self, *delays):
+        self.delays = delays
+        self.started = []
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            n = len(self.started)
+            self.started.append(time.monotonic())
+        time.sleep(self.delays[n])
+        return n
+
+
+@pytest.fixture
+def hedger(monkeypatch):
+    monkeypatch.setattr(AI, "HEDGE_DEFAULT_DELAY", 0.1)
+    return AI.RequestHedger(hedging=True)
+
+
+def test_a_fast_call_is_not_duplicated(hedger):
+    call = SlowCall(0.0)
+    assert hedger.run(call) == 0
+    assert len(call.started) == 1
+
+
+def test_a_slow_call_is_duplicated_after_the_delay_and_the_duplicate_can_win(hedger):
+    call = SlowCall(1.0, 0.0)
+    assert hedger.run(call) == 1
+    assert call.started[1] - call.started[0] >= AI.HEDGE_DEFAULT_DELAY
+
+
+def test_the_original_still_wins_if_it_finishes_first(hedger):
+    call = SlowCall(0.3, 1.0)
+    assert hedger.run(call) == 0
+    assert len(call.started) == 2
+
+
+def test_the_hedge_quota_stops_duplicates(hedger):
+    hedger.hedge_quota = AI.RequestQuota(1)
+    call = SlowCall(0.5, 0.0, 0.3)
+
+    assert hedger.run(call) == 1
+    assert hedger.run(call) == 2  # Waited for the slow original instead
+    assert len(call.started) == 3
+
+
+def test_the_p95_latency_replaces_the_default_delay_once_enough_calls_were_timed(monkeypatch):
+    monkeypatch.setattr(AI, "HEDGE_DEFAULT_DELAY", 30.0)
+    hedger = AI.RequestHedger(hedging=True)
+    for _ in range(AI.HEDGE_MIN_SAMPLES - 1):
+        hedger.run(SlowCall(0.0))
+    assert hedger.hedge_delay() == AI.HEDGE_DEFAULT_DELAY
+
+    hedger.run(SlowCall(0.0))
+    assert hedger.hedge_delay() < 0.1
+
+    call = SlowCall(1.0, 0.0)  # Duplicated long before the 30 second default
+    assert hedger.run(call) == 1
+
+
+def test_hedge_delay_is_the_95th_percentile():
+    hedger = AI.RequestHedger()
+    hedger._latencies.extend(n / 100 for n in range(1, 101))
+    assert hedger.hedge_delay() == 0.95
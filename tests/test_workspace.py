@@ -0,0 +1,85 @@
+"""Behaviour tests for RootState loading and its background revalidation."""
+import os
+import threading
+
+import pytest
+
+import AI
+from conftest import write
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = tmp_path / "project"
+    root.mkdir()
+    write(root / "common.robot", "*** Keywords ***\nOpen Login Page\n    Go To    ${LOGIN_URL}\n")
+    write(root / "old.robot", "*** Keywords ***\nRemoved Keyword\n    Log    gone\n")
+    return str(root)
+
+
+def load(project, tmp_path):
+    result_cache = AI.BlockResultCache(str(tmp_path / "block_cache.jsonl"))
+    state = AI.RootState.load(project, str(tmp_path / "data"), result_cache)
+    assert state.revalidated.wait(10)
+    return state
+
+
+def test_loading_a_saved_root_picks_up_files_changed_since(project, tmp_path):
+    load(project, tmp_path)
+    new_file = os.path.join(project, "new.robot")
+    write(new_file, "*** Keywords ***\nSubmit Order\n    Click Button    ${SUBMIT}\n")
+    os.remove(os.path.join(project, "old.robot"))
+
+    state = load(project, tmp_path)
+
+    assert sorted(os.path.basename(path) for path in state.files) == ["common.robot", "new.robot"]
+    names = [document["name"] for document in state.definition_index.search("Submit Order Removed Keyword")]
+    assert names == ["Submit Order"]
+    assert new_file in state.block_index.file_blocks
+
+
+def test_revalidation_is_saved_for_the_next_load(project, tmp_path, monkeypatch):
+    load(project, tmp_path)
+    write(os.path.join(project, "new.robot"), "*** Keywords ***\nSubmit Order\n    Log    ok\n")
+    load(project, tmp_path)
+
+    monkeypatch.setattr(AI.RootState, "revalidate_in_background", lambda state: None)
+    state = AI.RootState.load(project, str(tmp_path / "data"), AI.BlockResultCache(str(tmp_path / "cache.jsonl")))
+
+    assert os.path.join(project, "new.robot") in state.files
+
+
+def test_a_missing_root_is_scanned_without_any_dialog(tmp_path, monkeypatch):
+    def no_dialogs(*args, **kwargs):
+        raise AssertionError("A dialog was opened off the Tk thread")
+
+    monkeypatch.setattr(AI.messagebox, "showwarning", no_dialogs)
+    state = load(str(tmp_path / "missing"), tmp_path)
+
+    assert state.files == []
+
+
+def test_loading_a_cold_root_does_not_block_warm_roots(project, tmp_path, monkeypatch):
+    workspace = AI.Workspace(workspace_dir=str(tmp_path / "workspace"))
+    workspace.result_cache = AI.BlockResultCache(str(tmp_path / "block_cache.jsonl"))
+    warm = workspace.get(project)
+    cold_root = tmp_path / "cold"
+    cold_root.mkdir()
+    loading, release = threading.Event(), threading.Event()
+    real_load = AI.RootState.load
+
+    def slow_load(root, data_dir, result_cache=None):
+        loading.set()
+        release.wait(10)
+        return real_load(root, data_dir, result_cache)
+
+    monkeypatch.setattr(AI.RootState, "load", slow_load)
+    cold = []
+    loader = threading.Thread(target=lambda: cold.append(workspace.get(str(cold_root))))
+    loader.start()
+    assert loading.wait(10)
+
+    assert workspace.get(project) is warm  # Answered while the cold root is still loading
+    release.set()
+    loader.join(10)
+    assert cold[0] is workspace.get(str(cold_root))